@@ -3,40 +3,323 @@
 PDF → TXT converter (text‑only, no GUI)
 
 Usage (terminal):
-    python app.py
+    python app.py [--jobs N] [--backend {pypdfium2,pypdf2}]
+
+Text is extracted with pypdfium2 (PDFium) when it is installed, falling
+back to PyPDF2 otherwise; --backend picks one explicitly.
+
+Pages are extracted in parallel worker processes; pass --jobs or set
+PDF_WORKERS to override the worker count (defaults to the number of
+CPUs). --jobs 1 extracts sequentially in the main process.
 """
 
+import argparse
+import mmap
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 
 try:
     from PyPDF2 import PdfReader
+    from PyPDF2.generic import IndirectObject
 except ImportError:
+    PdfReader = None
+
+# Installed text-extraction backends, fastest first.
+BACKENDS = [
+    name
+    for name, module in (("pypdfium2", pdfium), ("pypdf2", PdfReader))
+    if module is not None
+]
+
+if not BACKENDS:
     sys.exit(
-        "PyPDF2 is not installed. Install dependencies with:\n"
+        "Neither pypdfium2 nor PyPDF2 is installed. Install dependencies with:\n"
         "    pip install -r requirements.txt"
     )
 
 
-def pdf_to_text(pdf_path: Path) -> str:
-    """Extract plain text from a PDF file."""
-    reader = PdfReader(str(pdf_path))
-    text_parts = []
-    for page_num, page in enumerate(reader.pages, start=1):
+class ExtractionError(Exception):
+    """The PDF could not be read, as opposed to the output not written."""
+
+
+def _default_workers() -> int:
+    """Number of extraction workers: $PDF_WORKERS, else the CPU count."""
+    try:
+        return max(1, int(os.environ.get("PDF_WORKERS", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _open_pdf(pdf_path: str, backend: str):
+    """Open a PDF with the given backend."""
+    if backend == "pypdfium2":
+        return pdfium.PdfDocument(pdf_path)
+    # Handed a path, PyPDF2 copies the whole file into a BytesIO in every
+    # worker. A read-only mapping is shared through the page cache instead.
+    with open(pdf_path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, "MADV_RANDOM"):
+        mm.madvise(mmap.MADV_RANDOM)  # xref lookups jump around the file
+    # Lenient parsing skips xref/trailer validation; metadata is never read.
+    return PdfReader(mm, strict=False)
+
+
+def _close_pdf(doc, backend: str) -> None:
+    if backend == "pypdfium2":
+        doc.close()
+    else:
+        doc.stream.close()
+
+
+def _page_count(doc, backend: str) -> int:
+    if backend == "pypdfium2":
+        return len(doc)
+    return len(doc.pages)
+
+
+def _uses_fonts(resources) -> bool:
+    """Whether a PyPDF2 resource dictionary, or a form it draws, names a font.
+
+    Text can only be shown through a font resource, so a page without one
+    is an image-only scan and has nothing for extract_text() to find.
+    Producers often share one resource dictionary between many forms, so
+    each indirect object is visited once; an unusually large walk gives up
+    and answers True so extract_text() decides.
+    """
+    seen = set()
+
+    def first_visit(obj) -> bool:
+        if not isinstance(obj, IndirectObject):
+            return True
+        key = (obj.idnum, obj.generation)
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    pending = [resources]
+    while pending:
+        if len(seen) > 1000:
+            return True
+        resources = pending.pop()
+        if resources is None or not first_visit(resources):
+            continue
+        resources = resources.get_object()
+        if resources.get("/Font"):
+            return True
+        xobjects = resources.get("/XObject")
+        if not xobjects:
+            continue
+        for xobject in xobjects.get_object().values():
+            if not first_visit(xobject):
+                continue
+            xobject = xobject.get_object()
+            if xobject.get("/Subtype") == "/Form":
+                pending.append(xobject.get("/Resources"))
+    return False
+
+
+def _extract_page_text(doc, page_index: int, backend: str) -> str:
+    if backend == "pypdfium2":
+        page = doc[page_index]
         try:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-            else:
-                # Some PDFs contain only images; we just note the empty page.
-                text_parts.append(f"[Page {page_num} contains no extractable text]\n")
-        except Exception as exc:
-            text_parts.append(f"[Error extracting page {page_num}: {exc}]\n")
-    return "\n".join(text_parts)
+            textpage = page.get_textpage()
+            try:
+                # PDFium separates lines with CRLF.
+                return textpage.get_text_bounded().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+    page = doc.pages[page_index]
+    try:
+        has_fonts = _uses_fonts(page.get("/Resources"))
+    except Exception:
+        has_fonts = True  # malformed resources: let extract_text() decide
+    return page.extract_text() if has_fonts else ""
+
+
+def _page_text(doc, page_index: int, backend: str) -> str:
+    """Extract the text of a single page, or a placeholder note."""
+    page_num = page_index + 1
+    try:
+        text = _extract_page_text(doc, page_index, backend)
+        if text:
+            return text
+        # Some PDFs contain only images; we just note the empty page.
+        return f"[Page {page_num} contains no extractable text]\n"
+    except Exception as exc:
+        return f"[Error extracting page {page_num}: {exc}]\n"
+
+
+# Pages handed to a worker per task. Tasks are small and only a few are
+# in flight at once, so finished text waiting behind a slow range stays
+# bounded instead of growing with the document. Workers are capped by the
+# task count, since each one parses the PDF when it starts; documents of
+# up to one task's worth of pages are extracted in-process.
+_PAGES_PER_TASK = 16
+
+# Each worker process opens the PDF once (document objects don't pickle).
+_worker_doc = None
+_worker_backend = None
+
+
+def _init_worker(pdf_path: str, backend: str) -> None:
+    global _worker_doc, _worker_backend
+    _worker_doc = _open_pdf(pdf_path, backend)
+    _worker_backend = backend
+
+
+def _extract_page_range(start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) from the worker's open document."""
+    return [_page_text(_worker_doc, i, _worker_backend) for i in range(start, stop)]
+
+
+def _iter_pages_in_process(doc, page_count: int, backend: str) -> Iterator[str]:
+    """Yield each page of an already open document, closing it when done."""
+    try:
+        for i in range(page_count):
+            yield _page_text(doc, i, backend)
+    finally:
+        _close_pdf(doc, backend)
+
+
+def _iter_pages_in_workers(
+    pdf_path: str, backend: str, page_count: int, workers: int
+) -> Iterator[str]:
+    """Yield each page in order, extracted by a pool of worker processes."""
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(pdf_path, backend),
+    ) as pool:
+        in_flight = deque()
+        for start in range(0, page_count, _PAGES_PER_TASK):
+            stop = min(start + _PAGES_PER_TASK, page_count)
+            in_flight.append(pool.submit(_extract_page_range, start, stop))
+            # Results are consumed in submission order, so page order holds.
+            if len(in_flight) >= 2 * workers:
+                yield from _task_result(in_flight.popleft())
+        while in_flight:
+            yield from _task_result(in_flight.popleft())
+
+
+def _task_result(future) -> List[str]:
+    try:
+        return future.result()
+    except Exception as exc:
+        raise ExtractionError(f"worker failed: {exc}") from exc
+
+
+def iter_page_texts(
+    pdf_path: Path, workers: Optional[int] = None, backend: Optional[str] = None
+) -> Iterator[str]:
+    """Return an iterator over the text of each page, in order.
+
+    Pages are extracted by up to *workers* processes (never more than there
+    are page ranges to hand out) in small ranges, only a few of which are
+    in flight at once, so memory stays bounded however long the document is.
+
+    The document is opened and its pages counted before this returns, so
+    an unreadable file raises ExtractionError here rather than part-way
+    through writing the output. *backend* must be one of BACKENDS; it
+    defaults to the fastest installed.
+    """
+    backend = backend or BACKENDS[0]
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"unknown or uninstalled backend {backend!r}; "
+            f"installed: {', '.join(BACKENDS)}"
+        )
+    doc = None
+    try:
+        doc = _open_pdf(str(pdf_path), backend)
+        page_count = _page_count(doc, backend)
+    except Exception as exc:  # each backend raises its own error types
+        if doc is not None:
+            _close_pdf(doc, backend)
+        raise ExtractionError(f"cannot read {pdf_path.name}: {exc}") from exc
+
+    task_count = -(-page_count // _PAGES_PER_TASK)
+    workers = min(workers or _default_workers(), task_count)
+    if workers <= 1:
+        return _iter_pages_in_process(doc, page_count, backend)
+    _close_pdf(doc, backend)
+    return _iter_pages_in_workers(str(pdf_path), backend, page_count, workers)
+
+
+def pdf_to_text(
+    pdf_path: Path, workers: Optional[int] = None, backend: Optional[str] = None
+) -> str:
+    """Extract plain text from a PDF file."""
+    return "\n".join(iter_page_texts(pdf_path, workers, backend))
+
+
+def save_pages(txt_path: Path, pages: Iterable[str]) -> int:
+    """Write page texts to *txt_path*, newline-separated; return its size.
+
+    Pages go to a temporary file in the same directory, which replaces
+    *txt_path* only once everything is written; a failed run leaves any
+    existing output untouched.
+    """
+
+    def chunks() -> Iterator[str]:
+        for page_index, page_text in enumerate(pages):
+            if page_index:
+                yield "\n"
+            yield page_text
+
+    tmp_path = txt_path.with_name(f".{txt_path.name}.{os.getpid()}.tmp")
+    try:
+        # A large buffer batches the many small page writes into few syscalls.
+        with tmp_path.open("w", encoding="utf-8", buffering=4 * 1024 * 1024) as out:
+            out.writelines(chunks())
+        os.replace(tmp_path, txt_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return txt_path.stat().st_size
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert a PDF file to plain text.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="number of worker processes (default: $PDF_WORKERS or CPU count)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("pypdfium2", "pypdf2"),
+        default=BACKENDS[0],
+        help=f"text extraction library (default: {BACKENDS[0]})",
+    )
+    args = parser.parse_args()
+    if args.backend not in BACKENDS:
+        parser.error(f"backend '{args.backend}' is not installed")
+
     # --------------------------------------------------------------
     # 1️⃣ Prompt the user for the PDF location
     # --------------------------------------------------------------
@@ -48,19 +331,18 @@ def main() -> None:
         sys.exit(1)
 
     # --------------------------------------------------------------
-    # 2️⃣ Convert PDF → text
+    # 2️⃣ Convert PDF → text, writing each page to the output .txt
+    #    file (same folder, same base name) as soon as it is ready
     # --------------------------------------------------------------
     print(f"🔎  Extracting text from '{pdf_path.name}' …")
-    extracted_text = pdf_to_text(pdf_path)
-
-    # --------------------------------------------------------------
-    # 3️⃣ Write output .txt file (same folder, same base name)
-    # --------------------------------------------------------------
     txt_path = pdf_path.with_suffix(".txt")
     try:
-        txt_path.write_text(extracted_text, encoding="utf-8")
-        print(f"✅  Text saved to: {txt_path}")
-    except Exception as exc:
+        size = save_pages(txt_path, iter_page_texts(pdf_path, args.jobs, args.backend))
+        print(f"✅  Text saved to: {txt_path} ({size:,} bytes)")
+    except ExtractionError as exc:
+        print(f"❌  Failed to extract text: {exc}")
+        sys.exit(1)
+    except OSError as exc:
         print(f"❌  Failed to write output file: {exc}")
         sys.exit(1)
 